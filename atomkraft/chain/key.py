@@ -0,0 +1,17 @@
+import coincurve
+from terra_sdk.key.mnemonic import MnemonicKey
+
+
+class Secp256k1MnemonicKey(MnemonicKey):
+    """`MnemonicKey` that signs with libsecp256k1 instead of pure-Python `ecdsa`.
+
+    Signatures are identical: deterministic (RFC 6979) ECDSA over the SHA-256
+    digest of the payload, in 64-byte low-s `r || s` form.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._signing_key = coincurve.PrivateKey(self.private_key)
+
+    def sign(self, payload: bytes) -> bytes:
+        return self._signing_key.sign_recoverable(payload)[:64]
@@ -5,7 +5,7 @@ import shutil
 from dataclasses import dataclass
 from pathlib import Path
 from subprocess import PIPE, Popen
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import bip_utils
 import hdwallet
@@ -16,7 +16,7 @@ from hdwallet.symbols import ATOM
 from .. import utils
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConfigPort:
     title: str
     config_file: Path
@@ -71,6 +71,7 @@ class Account:
         self.wallet = hdwallet.BIP44HDWallet(symbol=ATOM).from_entropy(
             entropy=self.entropy, language="english", passphrase=""
         )
+        self._bech32_addresses: Dict[str, str] = {}
 
     @property
     def mnemonic(self) -> Optional[str]:
@@ -83,7 +84,11 @@ class Account:
         return self.bech32_address(f"{prefix}valoper")
 
     def bech32_address(self, prefix) -> str:
-        return bip_utils.Bech32Encoder.Encode(prefix, bytes.fromhex(self.wallet.hash()))
+        if prefix not in self._bech32_addresses:
+            self._bech32_addresses[prefix] = bip_utils.Bech32Encoder.Encode(
+                prefix, bytes.fromhex(self.wallet.hash())
+            )
+        return self._bech32_addresses[prefix]
 
     def __repr__(self) -> str:
         return json.dumps(self.wallet.dumps(), indent=2)
@@ -110,6 +115,7 @@ class Node:
         self.hrp_prefix = hrp_prefix
         self.overwrite = overwrite
         self.keep = keep
+        self.node_id: Optional[str] = None
         self._popen = None
         self._stdout = None
         self._stderr = None
@@ -119,7 +125,16 @@ class Node:
             shutil.rmtree(self.home_dir)
         args = f"init {self.moniker} --chain-id {self.chain_id}".split()
         _, data = self._execute(args, stderr=PIPE)
-        return json.loads(data.decode())
+        info = json.loads(data.decode())
+        self.node_id = info["node_id"]
+        return info
+
+    @property
+    def gentx_file(self) -> Path:
+        # `gentx` writes its output to config/gentx/gentx-<node id>.json
+        if self.node_id is None:
+            raise RuntimeError(f"Node({self.moniker}) has no node id, run init() first")
+        return Path(f"config/gentx/gentx-{self.node_id}.json")
 
     def add_key(self, account: Account):
         argstr = (
@@ -142,6 +157,51 @@ class Node:
         argstr = f"add-genesis-account {account.address(self.hrp_prefix)} {coins_str} --keyring-backend test --output json"
         self._execute(argstr.split())
 
+    def add_accounts(self, accounts: List[Tuple[Account, Union[Dict[str, int], int]]]):
+        # same genesis edits as `add-genesis-account`, without a process per account
+        genesis_file = Path("config/genesis.json")
+        genesis = self.get(genesis_file)
+        auth_accounts = genesis["app_state"]["auth"]["accounts"]
+        bank = genesis["app_state"]["bank"]
+        addresses = {e.get("address") for e in auth_accounts}
+        supply = {e["denom"]: int(e["amount"]) for e in bank["supply"]}
+        for (account, coins) in accounts:
+            if isinstance(coins, int):
+                coins = {self.denom: coins}
+            if any(amount < 0 for amount in coins.values()):
+                raise ValueError(f"Negative coin amount for {account.name}: {coins}")
+            # like `sdk.ParseCoinsNormalized`, drop zero-amount coins
+            coins = {denom: amount for (denom, amount) in coins.items() if amount}
+            address = account.address(self.hrp_prefix)
+            if address in addresses:
+                raise RuntimeError(f"Cannot add account at existing address {address}")
+            addresses.add(address)
+            auth_accounts.append(
+                {
+                    "@type": "/cosmos.auth.v1beta1.BaseAccount",
+                    "address": address,
+                    "pub_key": None,
+                    "account_number": "0",
+                    "sequence": "0",
+                }
+            )
+            bank["balances"].append(
+                {
+                    "address": address,
+                    "coins": [
+                        {"denom": denom, "amount": str(amount)}
+                        for (denom, amount) in sorted(coins.items())
+                    ],
+                }
+            )
+            for (denom, amount) in coins.items():
+                supply[denom] = supply.get(denom, 0) + amount
+        bank["supply"] = [
+            {"denom": denom, "amount": str(amount)}
+            for (denom, amount) in sorted(supply.items())
+        ]
+        self.set(genesis_file, genesis)
+
     def add_validator(self, account: Account, staking_amount: int):
         argstr = f"gentx {account.name} {staking_amount}{self.denom} --keyring-backend test --chain-id {self.chain_id} --output json"
         self._execute(argstr.split(), stderr=PIPE)
@@ -151,24 +211,45 @@ class Node:
         _, data = self._execute(argstr.split(), stderr=PIPE)
         return json.loads(data.decode())
 
+    # kept for API compatibility, Testnet.prepare() uses add_gentx
     def copy_gentx_from(self, other: "Node"):
         for file in glob.glob(f"{other.home_dir}/config/gentx/*.json"):
             shutil.copy(file, f"{self.home_dir}/config/gentx")
 
+    def add_gentx(self, gentx_file: Path):
+        shutil.copy(gentx_file, self.home_dir / "config/gentx")
+
     def copy_genesis_from(self, other: "Node"):
         for file in glob.glob(f"{other.home_dir}/config/genesis.json"):
             shutil.copy(file, f"{self.home_dir}/config")
 
-    def get(self, path: Path, property_path: Optional[str] = None):
+    def _load(self, path: Path):
         with open(self.home_dir / path, encoding="utf-8") as f:
-            match path.suffixes[-1]:
+            match os.path.splitext(path)[-1]:
                 case ".json":
-                    data = json.load(f)
+                    return json.load(f)
                 case ".toml":
-                    data = tomlkit.load(f)
+                    return tomlkit.load(f)
                 case _:
                     raise RuntimeError(f"Unexpected file {path}")
-        return utils.query(data, property_path)
+
+    def _dump(self, path: Path, data: Any):
+        match os.path.splitext(path)[-1]:
+            case ".json":
+                content = json.dumps(data)
+            case ".toml":
+                content = tomlkit.dumps(data)
+            case _:
+                raise RuntimeError(f"Unexpected file {path}")
+        with open(self.home_dir / path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def get(self, path: Path, property_path: Optional[str] = None):
+        return utils.query(self._load(path), property_path)
+
+    def get_many(self, path: Path, property_paths: List[str]) -> List[Any]:
+        data = self._load(path)
+        return [utils.query(data, property_path) for property_path in property_paths]
 
     def get_port(self, port_config: ConfigPort):
         return self.get(
@@ -178,25 +259,16 @@ class Node:
 
     def set(self, path: Path, value: Any, property_path: Optional[str] = None):
         if property_path is not None:
-            with open(self.home_dir / path, encoding="utf-8") as f:
-                match os.path.splitext(path)[-1]:
-                    case ".json":
-                        main_data = json.load(f)
-                    case ".toml":
-                        main_data = tomlkit.load(f)
-                    case _:
-                        raise RuntimeError(f"Unexpected file {path}")
-            main_data = utils.update(main_data, property_path, value)
+            main_data = utils.update(self._load(path), property_path, value)
         else:
             main_data = value
-        with open(self.home_dir / path, "w", encoding="utf-8") as f:
-            match os.path.splitext(path)[-1]:
-                case ".json":
-                    json.dump(main_data, f)
-                case ".toml":
-                    tomlkit.dump(main_data, f)
-                case _:
-                    raise RuntimeError(f"Unexpected file {path}")
+        self._dump(path, main_data)
+
+    def set_many(self, path: Path, values: List[Tuple[str, Any]]):
+        data = self._load(path)
+        for (property_path, value) in values:
+            data = utils.update(data, property_path, value)
+        self._dump(path, data)
 
     def update(
         self,
@@ -206,6 +278,14 @@ class Node:
     ):
         self.set(path, function(self.get(path, property_path)), property_path)
 
+    def update_many(self, path: Path, updates: List[Tuple[str, Callable[[Any], Any]]]):
+        data = self._load(path)
+        for (property_path, function) in updates:
+            data = utils.update(
+                data, property_path, function(utils.query(data, property_path))
+            )
+        self._dump(path, data)
+
     def _execute(
         self,
         args,
@@ -1,30 +1,40 @@
 import asyncio
+import functools
 import socket
 import tempfile
 import time
-from contextlib import closing
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
 
-import numpy as np
-import tabulate
-import tomlkit
 from atomkraft.utils.project import ATOMKRAFT_INTERNAL_DIR, ATOMKRAFT_VAL_DIR_PREFIX
-from grpclib.client import Channel
-from terra_proto.cosmos.auth.v1beta1 import BaseAccount
-from terra_proto.cosmos.auth.v1beta1 import QueryStub as AuthQueryStub
-from terra_proto.cosmos.base.abci.v1beta1 import TxResponse
-from terra_proto.cosmos.tx.v1beta1 import BroadcastMode, ServiceStub
-from terra_sdk.client.lcd import LCDClient
-from terra_sdk.client.lcd.api.tx import CreateTxOptions
-from terra_sdk.core import Coins
-from terra_sdk.core.fee import Fee
-from terra_sdk.core.msg import Msg
-from terra_sdk.key.mnemonic import MnemonicKey
 
 from .node import Account, AccountId, ConfigPort, Node
 from .utils import get_free_ports, update_port
 
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
+
+# grpclib, terra_proto and terra_sdk are slow to import and only needed
+# to talk to a running testnet, so they are imported where they are used
+if TYPE_CHECKING:
+    from grpclib.client import Channel
+    from terra_proto.cosmos.base.abci.v1beta1 import TxResponse
+    from terra_sdk.client.lcd import LCDClient, Wallet
+    from terra_sdk.core.msg import Msg
+
 VALIDATOR_DIR = "validator_nodes"
 
 Bank = Dict[AccountId, Dict[str, int]]
@@ -42,8 +52,8 @@ class Testnet:
         *,
         seed: Optional[str] = None,
         coin_type: int = 118,
-        config_genesis: Dict = {},
-        config_node: Dict = {},
+        config_genesis: Optional[Dict] = None,
+        config_node: Optional[Dict] = None,
         account_balance: Union[int, Bank] = 10**10,
         validator_balance: Union[int, Bank] = 10**10,
         overwrite: bool = True,
@@ -60,7 +70,11 @@ class Testnet:
         self.hrp_prefix: str = hrp_prefix
 
         self.coin_type: int = coin_type
+        if config_genesis is None:
+            config_genesis = {}
         self.config_genesis: Dict = config_genesis
+        if config_node is None:
+            config_node = {}
         self.config_node: Dict = config_node
         if isinstance(account_balance, int):
             account_balance_d = dict()
@@ -84,6 +98,8 @@ class Testnet:
         elif isinstance(data_dir, str):
             data_dir = Path(data_dir)
         self.data_dir = data_dir / VALIDATOR_DIR
+        self._lcdclient: Optional["LCDClient"] = None
+        self._wallets: Dict[AccountId, "Wallet"] = {}
 
     def set_account_balances(self, balances: Bank):
         self.account_balances = balances
@@ -130,11 +146,12 @@ class Testnet:
             a: Account(a, group="acc", seed=self._account_seed)
             for a in self._account_ids
         }
+        self._wallets.clear()
 
     @staticmethod
     def load_toml(path: Path, **kwargs):
-        with open(path) as f:
-            data = tomlkit.load(f)
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
 
         for (k, v) in kwargs.items():
             data[k] = str(v)
@@ -142,7 +159,8 @@ class Testnet:
         return Testnet(**data)
 
     @staticmethod
-    def ports() -> Dict[str, ConfigPort]:
+    @functools.lru_cache(maxsize=1)
+    def ports() -> Mapping[str, ConfigPort]:
         data = {}
 
         # config.toml
@@ -166,17 +184,50 @@ class Testnet:
             "gRPC", Path("config/app.toml"), "grpc-web.address"
         )
         # dict["rosetta"] = ConfigPort("Rosetta", "config/app.toml", "rosetta.address")
-        return data
+        # cached and shared by every Testnet, so hand out a read-only view
+        return types.MappingProxyType(data)
 
     def get_validator_port(self, validator_id: AccountId, port_type: str):
         return self.validator_nodes[validator_id].get_port(self.ports()[port_type])
 
-    def get_grpc_channel(self, validator_id: Optional[AccountId] = None) -> Channel:
+    def get_grpc_channel(self, validator_id: Optional[AccountId] = None) -> "Channel":
+        from grpclib.client import Channel
+
         if validator_id is None:
             validator_id = self._lead_validator
         grpc_ip, grpc_port = self.get_validator_port(validator_id, "grpc").split(":", 1)
         return Channel(host=grpc_ip, port=int(grpc_port))
 
+    def get_wallet(self, account_id: AccountId) -> "Wallet":
+        from terra_sdk.client.lcd import LCDClient
+
+        from .key import Secp256k1MnemonicKey
+
+        if account_id not in self._wallets:
+            account = self.accounts[account_id]
+            if account.mnemonic is None:
+                raise ValueError(f"Account({account.name}) do not have mnemonic")
+            if self._lcdclient is None:
+                self._lcdclient = LCDClient("ip", chain_id="phoenix-1")
+            self._lcdclient.chain_id = self.chain_id
+            self._wallets[account_id] = self._lcdclient.wallet(
+                Secp256k1MnemonicKey(
+                    mnemonic=account.mnemonic,
+                    coin_type=self.coin_type,
+                )
+            )
+        return self._wallets[account_id]
+
+    def _run_on_nodes(
+        self, function: Callable[[AccountId, Node], Any]
+    ) -> Dict[AccountId, Any]:
+        # node commands are independent subprocesses, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(self.validator_nodes)) as executor:
+            results = executor.map(
+                function, self.validator_nodes.keys(), self.validator_nodes.values()
+            )
+            return dict(zip(self.validator_nodes.keys(), results))
+
     def prepare(self):
         self.finalize_accounts()
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -197,23 +248,23 @@ class Testnet:
             for validator_id in self.validators.keys()
         }
 
-        for node in self.validator_nodes.values():
-            node.init()
+        self._run_on_nodes(lambda _, node: node.init())
 
-        for (k, v) in self.config_genesis.items():
-            self.validator_nodes[self._lead_validator].set(
-                Path("config/genesis.json"), v, k
+        if self.config_genesis:
+            self.validator_nodes[self._lead_validator].set_many(
+                Path("config/genesis.json"), list(self.config_genesis.items())
             )
 
-        for (v_id, validator) in self.validators.items():
-            self.validator_nodes[self._lead_validator].add_account(
-                validator, self.validator_balances[v_id]
-            )
-
-        for (a_id, account) in self.accounts.items():
-            self.validator_nodes[self._lead_validator].add_account(
-                account, self.account_balances[a_id]
-            )
+        self.validator_nodes[self._lead_validator].add_accounts(
+            [
+                (validator, self.validator_balances[v_id])
+                for (v_id, validator) in self.validators.items()
+            ]
+            + [
+                (account, self.account_balances[a_id])
+                for (a_id, account) in self.accounts.items()
+            ]
+        )
 
         for node_id, node in self.validator_nodes.items():
             if node_id != self._lead_validator:
@@ -221,43 +272,57 @@ class Testnet:
                     self.validator_nodes[self._lead_validator]
                 )
 
-        # very hacky
-        all_ports = (
-            np.array(get_free_ports(len(self.ports()) * (len(self.validators) - 1)))
-            .reshape((-1, len(self.ports())))
-            .tolist()
+        n_ports = len(self.ports())
+        port_configs: Dict[Path, List[ConfigPort]] = {}
+        for e_port in self.ports().values():
+            port_configs.setdefault(e_port.config_file, []).append(e_port)
+
+        free_ports = get_free_ports(n_ports * (len(self.validators) - 1))
+        port_groups = (
+            free_ports[i : i + n_ports] for i in range(0, len(free_ports), n_ports)
         )
 
+        node_configs = [
+            (Path(f"config/{config_file}.toml"), list(configs.items()))
+            for (config_file, configs) in self.config_node.items()
+            if configs
+        ]
+
         all_port_data = []
 
         for (node_id, node) in self.validator_nodes.items():
-            for (config_file, configs) in self.config_node.items():
-                for (k, v) in configs.items():
-                    if isinstance(v, str):
-                        # TODO: avoid tomlkit.items.str being a list
-                        node.set(Path(f"config/{config_file}.toml"), str(v), k)
-                    else:
-                        node.set(Path(f"config/{config_file}.toml"), v, k)
+            for (config_file, configs) in node_configs:
+                node.set_many(config_file, configs)
 
             if node_id != self._lead_validator:
-                ports = all_ports.pop()
-                for (j, e_port) in enumerate(self.ports().values()):
-                    node.update(
-                        e_port.config_file,
-                        lambda x: update_port(x, ports[j]),
-                        e_port.property_path,
+                ports = iter(next(port_groups))
+                for (port_file, e_ports) in port_configs.items():
+                    node.update_many(
+                        port_file,
+                        [
+                            (
+                                e_port.property_path,
+                                functools.partial(update_port, new=next(ports)),
+                            )
+                            for e_port in e_ports
+                        ],
                     )
 
             port_data = [node.moniker]
-            for e_port in self.ports().values():
-                port_data.append(node.get(e_port.config_file, e_port.property_path))
+            for (port_file, e_ports) in port_configs.items():
+                port_data.extend(
+                    node.get_many(port_file, [e.property_path for e in e_ports])
+                )
             all_port_data.append(port_data)
 
         if self.verbose:
+            import tabulate
+
             print(
                 tabulate.tabulate(
                     all_port_data,
-                    headers=["Moniker"] + [e.title for e in self.ports().values()],
+                    headers=["Moniker"]
+                    + [e.title for e_ports in port_configs.values() for e in e_ports],
                 )
             )
 
@@ -281,42 +346,45 @@ class Testnet:
                 )
             )
 
-        for (node_id, node) in self.validator_nodes.items():
+        p2p = self.ports()["p2p"]
+
+        def create_gentx(node_id: AccountId, node: Node) -> Path:
             node.add_key(self.validators[node_id])
-            p2p = self.ports()["p2p"]
             node.add_validator(
                 self.validators[node_id], self.validator_balances[node_id][self.denom]
             )
 
+            gentx_file = node.home_dir / node.gentx_file
             if node_id != self._lead_validator:
                 # because this
                 # https://github.com/cosmos/cosmos-sdk/blob/88ee7fb2e9303f43c52bd32410901841cad491fb/x/staking/client/cli/tx.go#L599
-                gentx_file = next(node.home_dir.glob("config/gentx/*json"))
-                gentx_file = gentx_file.relative_to(node.home_dir)
                 node_p2p = node.get(p2p.config_file, p2p.property_path).rsplit(
                     ":", maxsplit=1
                 )[-1]
-                node.update(gentx_file, lambda x: update_port(x, node_p2p), "body.memo")
-                node.sign(self.validators[node_id], node.home_dir / gentx_file)
+                node.update(
+                    node.gentx_file,
+                    lambda x: update_port(x, node_p2p),
+                    "body.memo",
+                )
+                node.sign(self.validators[node_id], gentx_file)
+            return gentx_file
 
-        for (id_a, node_a) in self.validator_nodes.items():
-            for (id_b, node_b) in self.validator_nodes.items():
-                if id_a != id_b:
-                    node_a.copy_gentx_from(node_b)
+        gentx_files = self._run_on_nodes(create_gentx)
 
-        for node in self.validator_nodes.values():
-            node.collect_gentx()
+        for (node_id, node) in self.validator_nodes.items():
+            for (gentx_id, gentx_file) in gentx_files.items():
+                if node_id != gentx_id:
+                    node.add_gentx(gentx_file)
+
+        self._run_on_nodes(lambda _, node: node.collect_gentx())
 
     def spinup(self):
-        for node in self.validator_nodes.values():
-            node.start()
+        self._run_on_nodes(lambda _, node: node.start())
+        rpc = self.ports()["rpc"]
         for node in self.validator_nodes.values():
             while True:
                 try:
-                    addr = node.get(
-                        self.ports()["rpc"].config_file,
-                        self.ports()["rpc"].property_path,
-                    )
+                    addr = node.get(rpc.config_file, rpc.property_path)
                     ip, port = addr.split("//")[-1].split(":")
                     with socket.create_connection(
                         (ip, port),
@@ -339,65 +407,62 @@ class Testnet:
     def broadcast_transaction(
         self,
         account_id: AccountId,
-        msgs: Union[Msg, List[Msg]],
+        msgs: Union["Msg", List["Msg"]],
         *,
         gas: int = 200_000,
         fee_amount: int = 0,
         validator_id: Optional[AccountId] = None,
-    ) -> TxResponse:
+    ) -> "TxResponse":
+        from terra_proto.cosmos.auth.v1beta1 import BaseAccount
+        from terra_proto.cosmos.auth.v1beta1 import QueryStub as AuthQueryStub
+        from terra_proto.cosmos.tx.v1beta1 import BroadcastMode, ServiceStub
+        from terra_sdk.client.lcd.api.tx import CreateTxOptions
+        from terra_sdk.core import Coins
+        from terra_sdk.core.fee import Fee
+        from terra_sdk.core.msg import Msg
+
         if validator_id is None:
             validator_id = self._lead_validator
 
-        if not isinstance(msgs, list):
+        if isinstance(msgs, Msg):
             msgs = [msgs]
 
         account = self.accounts[account_id]
-
-        lcdclient = LCDClient("ip", chain_id="phoenix-1")
-        lcdclient.chain_id = self.chain_id
-
-        if account.mnemonic is None:
-            raise ValueError(f"Account({account.name}) do not have mnemonic")
-
-        wallet = lcdclient.wallet(
-            MnemonicKey(
-                mnemonic=account.mnemonic,
-                coin_type=self.coin_type,
-            )
-        )
-
-        with closing(self.get_grpc_channel(validator_id=validator_id)) as channel:
-            stub = AuthQueryStub(channel)
-            result = asyncio.run(stub.account(address=account.address(self.hrp_prefix)))
-            account_info = BaseAccount().parse(result.account.value)
-            account_number = account_info.account_number
-            sequence = account_info.sequence
-
-            tx = wallet.create_and_sign_tx(
-                CreateTxOptions(
-                    msgs,
-                    fee=Fee(gas, Coins(f"{fee_amount}{self.denom}")),
-                    account_number=account_number,
-                    sequence=sequence,
+        wallet = self.get_wallet(account_id)
+
+        async def _broadcast() -> "TxResponse":
+            # the channel must be created inside the running loop
+            channel = self.get_grpc_channel(validator_id=validator_id)
+            try:
+                result = await AuthQueryStub(channel).account(
+                    address=account.address(self.hrp_prefix)
+                )
+                account_info = BaseAccount().parse(result.account.value)
+
+                tx = wallet.create_and_sign_tx(
+                    CreateTxOptions(
+                        msgs,
+                        fee=Fee(gas, Coins(f"{fee_amount}{self.denom}")),
+                        account_number=account_info.account_number,
+                        sequence=account_info.sequence,
+                    )
                 )
-            )
 
-            service = ServiceStub(channel)
-
-            # # BROADCAST_MODE_BLOCK defines a tx broadcasting mode where the client waits
-            # # for the tx to be committed in a block.
-            # BROADCAST_MODE_BLOCK = 1
-            # # BROADCAST_MODE_SYNC defines a tx broadcasting mode where the client waits
-            # # for a CheckTx execution response only.
-            # BROADCAST_MODE_SYNC = 2
-            # # BROADCAST_MODE_ASYNC defines a tx broadcasting mode where the client
-            # # returns immediately.
-            # BROADCAST_MODE_ASYNC = 3
-            result = asyncio.run(
-                service.broadcast_tx(
+                # # BROADCAST_MODE_BLOCK defines a tx broadcasting mode where the client waits
+                # # for the tx to be committed in a block.
+                # BROADCAST_MODE_BLOCK = 1
+                # # BROADCAST_MODE_SYNC defines a tx broadcasting mode where the client waits
+                # # for a CheckTx execution response only.
+                # BROADCAST_MODE_SYNC = 2
+                # # BROADCAST_MODE_ASYNC defines a tx broadcasting mode where the client
+                # # returns immediately.
+                # BROADCAST_MODE_ASYNC = 3
+                response = await ServiceStub(channel).broadcast_tx(
                     tx_bytes=bytes(tx.to_proto()),
                     mode=BroadcastMode.BROADCAST_MODE_BLOCK,
                 )
-            ).tx_response
+                return response.tx_response
+            finally:
+                channel.close()
 
-        return result
+        return asyncio.run(_broadcast())
@@ -46,5 +46,3 @@ def transfer(testnet: Testnet, action):
 
     logging.debug(f"[MSG] {msg}")
     logging.debug(f"[RES] {result}")
-
-    time.sleep(1)
@@ -157,13 +157,14 @@ def get_count(testnet: Testnet, state: Dict, count):
     dict_msg = {"get_count": {}}
     contract_address = state["contract_address"]
 
-    with contextlib.closing(testnet.get_grpc_channel()) as channel:
-        stub = QueryStub(channel)
-        result = asyncio.run(
-            stub.smart_contract_state(
+    async def query():
+        # create the channel inside the running loop, grpclib binds it on init
+        with contextlib.closing(testnet.get_grpc_channel()) as channel:
+            return await QueryStub(channel).smart_contract_state(
                 address=contract_address, query_data=json.dumps(dict_msg).encode()
             )
-        )
+
+    result = asyncio.run(query())
 
     logging.info("Response: %s\n", json.loads(result.data.decode()))
 
@@ -0,0 +1,23 @@
+import random
+
+import pytest
+from atomkraft.chain.key import Secp256k1MnemonicKey
+from atomkraft.chain.node import Account
+from terra_sdk.key.mnemonic import MnemonicKey
+
+accounts = [Account(0, group="val"), Account(1, group="acc"), Account("alice")]
+
+
+@pytest.mark.parametrize("account", accounts, ids=lambda a: str(a.name))
+@pytest.mark.parametrize("coin_type", [118, 330])
+def test_sign_matches_mnemonic_key(account, coin_type):
+    key = Secp256k1MnemonicKey(mnemonic=account.mnemonic, coin_type=coin_type)
+    reference = MnemonicKey(mnemonic=account.mnemonic, coin_type=coin_type)
+    assert key.private_key == reference.private_key
+    assert key.public_key == reference.public_key
+
+    rng = random.Random(f"{account.name}/{coin_type}")
+    for size in [0, 1, 32, 100, 1000]:
+        for _ in range(10):
+            payload = rng.randbytes(size)
+            assert key.sign(payload) == reference.sign(payload)
@@ -0,0 +1,212 @@
+import functools
+import json
+from pathlib import Path
+
+import pytest
+from atomkraft.chain.node import Account, Node
+from atomkraft.chain.utils import update_port
+
+GENESIS_FILE = Path("config/genesis.json")
+
+
+@pytest.fixture
+def node(tmp_path):
+    (tmp_path / "config").mkdir()
+    return Node("node", "test-chain", tmp_path, Path("simd"), keep=True, denom="stake")
+
+
+def write_genesis(node, accounts=(), balances=(), supply=()):
+    genesis = {
+        "app_state": {
+            "auth": {"accounts": list(accounts)},
+            "bank": {"balances": list(balances), "supply": list(supply)},
+        }
+    }
+    (node.home_dir / GENESIS_FILE).write_text(json.dumps(genesis))
+
+
+def read_app_state(node):
+    return json.loads((node.home_dir / GENESIS_FILE).read_text())["app_state"]
+
+
+def test_add_accounts(node):
+    write_genesis(node)
+    val, acc = Account(0, group="val"), Account(0, group="acc")
+    node.add_accounts([(val, 10), (acc, {"uatom": 5, "stake": 7})])
+
+    app_state = read_app_state(node)
+    assert [e["address"] for e in app_state["auth"]["accounts"]] == [
+        val.address("cosmos"),
+        acc.address("cosmos"),
+    ]
+    assert app_state["bank"]["balances"] == [
+        {
+            "address": val.address("cosmos"),
+            "coins": [{"denom": "stake", "amount": "10"}],
+        },
+        {
+            "address": acc.address("cosmos"),
+            "coins": [
+                {"denom": "stake", "amount": "7"},
+                {"denom": "uatom", "amount": "5"},
+            ],
+        },
+    ]
+    assert app_state["bank"]["supply"] == [
+        {"denom": "stake", "amount": "17"},
+        {"denom": "uatom", "amount": "5"},
+    ]
+
+
+def test_add_accounts_drops_zero_amounts(node):
+    write_genesis(node)
+    acc_a, acc_b = Account(0, group="acc"), Account(1, group="acc")
+    node.add_accounts([(acc_a, {"uatom": 5, "stake": 0}), (acc_b, 0)])
+
+    bank = read_app_state(node)["bank"]
+    assert [e["coins"] for e in bank["balances"]] == [
+        [{"denom": "uatom", "amount": "5"}],
+        [],
+    ]
+    assert bank["supply"] == [{"denom": "uatom", "amount": "5"}]
+
+
+def test_add_accounts_sums_existing_supply(node):
+    write_genesis(node, supply=[{"denom": "stake", "amount": "100"}])
+    node.add_accounts([(Account(0), 10)])
+
+    assert read_app_state(node)["bank"]["supply"] == [
+        {"denom": "stake", "amount": "110"}
+    ]
+
+
+def test_add_accounts_rejects_existing_address(node):
+    account = Account(0)
+    write_genesis(node, accounts=[{"address": account.address("cosmos")}])
+
+    with pytest.raises(RuntimeError, match="existing address"):
+        node.add_accounts([(account, 10)])
+
+
+def test_add_accounts_rejects_duplicates_in_batch(node):
+    write_genesis(node)
+
+    with pytest.raises(RuntimeError, match="existing address"):
+        node.add_accounts([(Account(0), 10), (Account(0), 20)])
+
+
+def test_add_accounts_rejects_negative_amounts(node):
+    write_genesis(node)
+
+    with pytest.raises(ValueError, match="Negative"):
+        node.add_accounts([(Account(0), {"stake": -1})])
+
+
+CONFIG_FILE = Path("config/config.toml")
+
+CONFIG_TOML = """\
+# TCP or UNIX socket address of the ABCI application
+proxy_app = "tcp://127.0.0.1:26658"
+
+[rpc]
+# TCP or UNIX socket address for the RPC server to listen on
+laddr = "tcp://127.0.0.1:26657"
+pprof_laddr = "localhost:6060"
+
+[p2p]
+laddr = "tcp://0.0.0.0:26656"
+seeds = ""
+"""
+
+
+@pytest.fixture
+def config_node(node):
+    (node.home_dir / CONFIG_FILE).write_text(CONFIG_TOML)
+    return node
+
+
+def test_get_many(config_node):
+    assert config_node.get_many(
+        CONFIG_FILE, ["rpc.laddr", "proxy_app", "p2p.laddr", "rpc.pprof_laddr"]
+    ) == [
+        "tcp://127.0.0.1:26657",
+        "tcp://127.0.0.1:26658",
+        "tcp://0.0.0.0:26656",
+        "localhost:6060",
+    ]
+
+
+def test_update_many(config_node):
+    property_paths = ["proxy_app", "rpc.laddr", "rpc.pprof_laddr", "p2p.laddr"]
+    config_node.update_many(
+        CONFIG_FILE,
+        [
+            (property_path, functools.partial(update_port, new=port))
+            for (property_path, port) in zip(property_paths, [1, 2, 3, 4])
+        ],
+    )
+
+    assert (config_node.home_dir / CONFIG_FILE).read_text() == (
+        CONFIG_TOML.replace("26658", "1")
+        .replace("26657", "2")
+        .replace("6060", "3")
+        .replace("26656", "4")
+    )
+    assert config_node.get_many(CONFIG_FILE, property_paths) == [
+        "tcp://127.0.0.1:1",
+        "tcp://127.0.0.1:2",
+        "localhost:3",
+        "tcp://0.0.0.0:4",
+    ]
+
+
+set_many_tests = [
+    [("rpc.laddr", "tcp://0.0.0.0:26657")],
+    [
+        ("proxy_app", "tcp://127.0.0.1:1"),
+        ("p2p", {"seeds": "id@127.0.0.1:26656"}),
+        ("rpc.pprof_laddr", "localhost:2"),
+    ],
+    [],
+]
+
+
+@pytest.mark.parametrize("values", set_many_tests)
+def test_set_many(config_node, tmp_path_factory, values):
+    expected_node = Node(
+        "expected",
+        "test-chain",
+        tmp_path_factory.mktemp("expected"),
+        Path("simd"),
+        keep=True,
+    )
+    (expected_node.home_dir / "config").mkdir()
+    (expected_node.home_dir / CONFIG_FILE).write_text(CONFIG_TOML)
+    for (property_path, value) in values:
+        expected_node.set(CONFIG_FILE, value, property_path)
+
+    config_node.set_many(CONFIG_FILE, values)
+
+    assert (config_node.home_dir / CONFIG_FILE).read_text() == (
+        expected_node.home_dir / CONFIG_FILE
+    ).read_text()
+
+
+def test_set_many_merges_nested_values(config_node):
+    config_node.set_many(
+        CONFIG_FILE,
+        [("p2p", {"seeds": "id@127.0.0.1:26656"}), ("rpc.laddr", "tcp://0.0.0.0:1")],
+    )
+
+    assert config_node.get(CONFIG_FILE, "p2p") == {
+        "laddr": "tcp://0.0.0.0:26656",
+        "seeds": "id@127.0.0.1:26656",
+    }
+    assert config_node.get(CONFIG_FILE, "rpc.laddr") == "tcp://0.0.0.0:1"
+
+
+def test_gentx_file(node):
+    with pytest.raises(RuntimeError, match="init"):
+        node.gentx_file
+    node.node_id = "abc123"
+    assert node.gentx_file == Path("config/gentx/gentx-abc123.json")